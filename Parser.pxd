@@ -0,0 +1,31 @@
+# Augments Parser.py when it is compiled with Cython (see setup.py): the
+# classes become extension types with typed attributes. Plain Python
+# imports of Parser.py ignore this file.
+
+cdef class Token:
+    cdef public object type
+    cdef public object value
+
+cdef class Lexer:
+    cdef public str text
+    cdef public Py_ssize_t pos
+    cdef object _codes
+    cdef Py_ssize_t _len
+    cdef public int tok_type
+    cdef public object tok_value
+
+cdef class ASTNode:
+    cdef public object type
+    cdef public list children
+
+cdef class _TokenBuffer:
+    cdef list _types
+    cdef list _values
+    cdef Py_ssize_t _i
+    cdef public int tok_type
+    cdef public object tok_value
+
+cdef class Parser:
+    cdef public object lexer
+    cdef public int tok_type
+    cdef public object tok_value
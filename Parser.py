@@ -1,6 +1,91 @@
 import re
+import sys
+from array import array
+
+try:
+    from _clexer import tokenize as _c_tokenize
+except ImportError:
+    _c_tokenize = None
+
+# Token types are small ints; _TYPE_NAMES maps them back for display.
+_TYPE_NAMES = (
+    'EOF',
+    'NUMBER',
+    'ID',
+    'VAR',
+    'ADD',
+    'SUB',
+    'MUL',
+    'DIV',
+    'ASSIGN',
+    'EQ',
+    'LPAREN',
+    'RPAREN',
+    'LBRACE',
+    'RBRACE',
+    'SEMICOLON',
+)
+(
+    _T_EOF,
+    _T_NUMBER,
+    _T_ID,
+    _T_VAR,
+    _T_ADD,
+    _T_SUB,
+    _T_MUL,
+    _T_DIV,
+    _T_ASSIGN,
+    _T_EQ,
+    _T_LPAREN,
+    _T_RPAREN,
+    _T_LBRACE,
+    _T_RBRACE,
+    _T_SEMICOLON,
+) = range(len(_TYPE_NAMES))
+
+_OPS = {
+    '+': _T_ADD,
+    '-': _T_SUB,
+    '*': _T_MUL,
+    '/': _T_DIV,
+    '=': _T_ASSIGN,
+    '==': _T_EQ,
+    '(': _T_LPAREN,
+    ')': _T_RPAREN,
+    '{': _T_LBRACE,
+    '}': _T_RBRACE,
+    ';': _T_SEMICOLON,
+}
+
+_KEYWORDS = {
+    'var': _T_VAR,
+}
+
+# Single-character operators indexed by code point; '=' is left to the
+# master regex since it may start '=='.
+_PUNCT = [None] * 128
+for _op, _type in _OPS.items():
+    if len(_op) == 1 and _op != '=':
+        _PUNCT[ord(_op)] = _type
+del _op, _type
+
+# Binding power of each token type as a binary operator, indexed by type;
+# 0 means the token does not continue an expression.
+_PREC = [0] * len(_TYPE_NAMES)
+_PREC[_T_ADD] = _PREC[_T_SUB] = 1
+_PREC[_T_MUL] = _PREC[_T_DIV] = 2
+
+_MASTER = re.compile(
+    r'\s*(?:(?P<NUMBER>\d+)|(?P<ID>[^\W\d]\w*)|(?P<OP>'
+    + '|'.join(re.escape(op) for op in sorted(_OPS, key=len, reverse=True))
+    + r')|\Z)'
+)
+
+_UTF32_NATIVE = 'utf-32-le' if sys.byteorder == 'little' else 'utf-32-be'
 
 class Token:
+    __slots__ = ('type', 'value')
+
     def __init__(self, type, value):
         self.type = type
         self.value = value
@@ -12,161 +97,233 @@ class Lexer:
     def __init__(self, text):
         self.text = text
         self.pos = 0
-        self.current_char = self.text[self.pos] if self.text else None
-
-    def advance(self):
-        self.pos += 1
-        if self.pos < len(self.text):
-            self.current_char = self.text[self.pos]
+        # Indexing bytes yields ints, so the scan loop never builds 1-char strings;
+        # non-ASCII source gets the same int indexing from a 4-byte-per-char view.
+        if text.isascii():
+            self._codes = text.encode('ascii')
         else:
-            self.current_char = None
+            self._codes = memoryview(text.encode(_UTF32_NATIVE, 'surrogatepass')).cast('I')
+        self._len = len(text)
+        # advance() writes the next token here in place.
+        self.tok_type = _T_EOF
+        self.tok_value = None
 
-    def generate_tokens(self):
-        while self.current_char is not None:
-            if self.current_char.isspace():
-                self.advance()
-            elif self.current_char.isdigit():
-                yield self.generate_number()
-            elif self.current_char.isalpha() or self.current_char == '_':
-                yield self.generate_identifier()
-            elif self.current_char == '+':
-                yield Token('ADD', '+')
-                self.advance()
-            elif self.current_char == '-':
-                yield Token('SUB', '-')
-                self.advance()
-            elif self.current_char == '*':
-                yield Token('MUL', '*')
-                self.advance()
-            elif self.current_char == '/':
-                yield Token('DIV', '/')
-                self.advance()
-            elif self.current_char == '=':
-                self.advance()
-                if self.current_char == '=':
-                    self.advance()
-                    yield Token('EQ', '==')
+    def advance(self):
+        pos = self.pos
+        if pos < self._len:
+            text = self.text
+            code = self._codes[pos]
+            tok_type = _PUNCT[code] if code < 128 else None
+            if tok_type is not None:
+                self.pos = pos + 1
+                self.tok_type = tok_type
+                self.tok_value = text[pos]
+                return
+            m = _MASTER.match(text, pos)
+            if m is None:
+                raise Exception(f'Illegal character: {text[pos:].lstrip()[0]}')
+            self.pos = m.end()
+            kind = m.lastgroup
+            if kind is not None:
+                value = m.group(kind)
+                if kind == 'NUMBER':
+                    self.tok_type = _T_NUMBER
+                    self.tok_value = int(value)
+                elif kind == 'ID':
+                    self.tok_type = _KEYWORDS.get(value, _T_ID)
+                    self.tok_value = value
                 else:
-                    yield Token('ASSIGN', '=')
-            elif self.current_char == '(':
-                yield Token('LPAREN', '(')
-                self.advance()
-            elif self.current_char == ')':
-                yield Token('RPAREN', ')')
-                self.advance()
-            elif self.current_char == '{':
-                yield Token('LBRACE', '{')
-                self.advance()
-            elif self.current_char == '}':
-                yield Token('RBRACE', '}')
-                self.advance()
-            elif self.current_char == ';':
-                yield Token('SEMICOLON', ';')
-                self.advance()
-            else:
-                raise Exception(f'Illegal character: {self.current_char}')
-
-    def generate_number(self):
-        num_str = ''
-        while self.current_char is not None and self.current_char.isdigit():
-            num_str += self.current_char
-            self.advance()
-        return Token('NUMBER', int(num_str))
+                    self.tok_type = _OPS[value]
+                    self.tok_value = value
+                return
+        self.tok_type = _T_EOF
+        self.tok_value = None
 
-    def generate_identifier(self):
-        id_str = ''
-        while self.current_char is not None and (self.current_char.isalnum() or self.current_char == '_'):
-            id_str += self.current_char
-            self.advance()
-        if id_str == 'var':
-            return Token('VAR', id_str)
-        else:
-            return Token('ID', id_str)
+    def tokenize(self):
+        if _c_tokenize is not None:
+            types, values = _c_tokenize(self.text, self.pos)
+            self.pos = self._len
+            return array('i', types), values
+        types = array('i')
+        values = []
+        advance = self.advance
+        advance()
+        while self.tok_type != _T_EOF:
+            types.append(self.tok_type)
+            values.append(self.tok_value)
+            advance()
+        return types, values
+
+    def generate_tokens(self):
+        advance = self.advance
+        advance()
+        while self.tok_type != _T_EOF:
+            yield Token(_TYPE_NAMES[self.tok_type], self.tok_value)
+            advance()
 
 class ASTNode:
+    __slots__ = ('type', 'children')
+
     def __init__(self, type, children=None):
         self.type = type
         self.children = children if children is not None else []
 
     def __repr__(self):
-        return f'ASTNode({self.type}, {self.children})'
+        return format_ast(self)
+
+    @classmethod
+    def lift(cls, node):
+        root = cls(node[0])
+        stack = [(node, root)]
+        while stack:
+            item, lifted = stack.pop()
+            children = lifted.children
+            for child in item[1:]:
+                if type(child) is tuple:
+                    child_node = cls(child[0])
+                    stack.append((child, child_node))
+                    children.append(child_node)
+                else:
+                    children.append(child)
+        return root
+
+# Renders an ASTNode tree, or the (type, *children) tuples the parser
+# produces, as the same ASTNode(...) text without recursing.
+def format_ast(node):
+    out = []
+    stack = [node]
+    while stack:
+        item = stack.pop()
+        kind = type(item)
+        if kind is tuple:
+            tag, children = item[0], item[1:]
+        elif kind is ASTNode:
+            tag, children = item.type, item.children
+        else:
+            out.append(item)
+            continue
+        stack.append('])')
+        for index in range(len(children) - 1, -1, -1):
+            child = children[index]
+            stack.append(child if type(child) in (tuple, ASTNode) else repr(child))
+            if index:
+                stack.append(', ')
+        stack.append(f'ASTNode({tag}, [')
+    return ''.join(out)
+
+# Cursor over (types, values) from the C scanner, with the same in-place
+# advance()/tok_type/tok_value interface as Lexer.
+class _TokenBuffer:
+    def __init__(self, types, values):
+        types.append(_T_EOF)
+        values.append(None)
+        self._types = types
+        self._values = values
+        self._i = -1
+        self.tok_type = _T_EOF
+        self.tok_value = None
+
+    def advance(self):
+        i = self._i + 1
+        self._i = i
+        self.tok_type = self._types[i]
+        self.tok_value = self._values[i]
 
+# The parser drives an in-place advance() one token at a time: over the
+# C scanner's output when _clexer is built, otherwise straight off a Lexer.
+# No Token objects are built while parsing.
 class Parser:
-    def __init__(self, tokens):
-        self.tokens = tokens
-        self.current_token = next(self.tokens, None)
+    def __init__(self, text):
+        if _c_tokenize is not None:
+            self.lexer = _TokenBuffer(*_c_tokenize(text))
+        else:
+            self.lexer = Lexer(text)
+        self.advance()
+
+    def advance(self):
+        lexer = self.lexer
+        lexer.advance()
+        self.tok_type = lexer.tok_type
+        self.tok_value = lexer.tok_value
 
     def eat(self, token_type):
-        if self.current_token is not None and self.current_token.type == token_type:
-            self.current_token = next(self.tokens, None)
+        if self.tok_type == token_type:
+            self.advance()
         else:
-            raise SyntaxError(f'Expected {token_type}, got {self.current_token.type if self.current_token else None}')
+            raise SyntaxError(f'Expected {_TYPE_NAMES[token_type]}, got {_TYPE_NAMES[self.tok_type]}')
+
+    def unexpected(self):
+        return SyntaxError(f'Unexpected token: {_TYPE_NAMES[self.tok_type]}')
 
     def parse(self):
         program_ast = self.program()
-        if self.current_token is not None:
-            raise SyntaxError(f'Unexpected token: {self.current_token.type}')
+        if self.tok_type != _T_EOF:
+            raise self.unexpected()
         return program_ast
 
     def program(self):
         declarations = []
-        while self.current_token is not None:
+        while self.tok_type != _T_EOF:
             declarations.append(self.declaration())
-        return ASTNode('PROGRAM', declarations)
+        return ('PROGRAM', *declarations)
 
     def declaration(self):
-        if self.current_token.type == 'VAR':
-            return self.variable_declaration()
-        else:
-            raise SyntaxError(f'Unexpected token: {self.current_token.type}')
+        handler = self._DECL_DISPATCH.get(self.tok_type)
+        if handler is None:
+            raise self.unexpected()
+        return handler(self)
 
     def variable_declaration(self):
-        self.eat('VAR')
-        identifier = self.current_token.value
-        self.eat('ID')
-        self.eat('ASSIGN')
+        self.eat(_T_VAR)
+        identifier = self.tok_value
+        self.eat(_T_ID)
+        self.eat(_T_ASSIGN)
         value = self.expression()
-        self.eat('SEMICOLON')
-        return ASTNode('VAR_DECL', [identifier, value])
-
-    def expression(self):
-        result = self.term()
-        while self.current_token.type in ('ADD', 'SUB'):
-            token = self.current_token
-            if token.type == 'ADD':
-                self.eat('ADD')
-            elif token.type == 'SUB':
-                self.eat('SUB')
-            result = ASTNode(token.value, [result, self.term()])
-        return result
+        self.eat(_T_SEMICOLON)
+        return ('VAR_DECL', identifier, value)
 
-    def term(self):
+    def expression(self, min_prec=1):
         result = self.factor()
-        while self.current_token.type in ('MUL', 'DIV'):
-            token = self.current_token
-            if token.type == 'MUL':
-                self.eat('MUL')
-            elif token.type == 'DIV':
-                self.eat('DIV')
-            result = ASTNode(token.value, [result, self.factor()])
+        while True:
+            prec = _PREC[self.tok_type]
+            if prec < min_prec:
+                break
+            op = self.tok_value
+            self.advance()
+            result = (op, result, self.expression(prec + 1))
         return result
 
     def factor(self):
-        token = self.current_token
-        if token.type == 'NUMBER':
-            self.eat('NUMBER')
-            return ASTNode('NUMBER', [token.value])
-        elif token.type == 'ID':
-            identifier = token.value
-            self.eat('ID')
-            return ASTNode('ID', [identifier])
-        elif token.type == 'LPAREN':
-            self.eat('LPAREN')
-            result = self.expression()
-            self.eat('RPAREN')
-            return result
-        else:
-            raise SyntaxError(f'Unexpected token: {token.type}')
+        handler = self._FACTOR_DISPATCH.get(self.tok_type)
+        if handler is None:
+            raise self.unexpected()
+        return handler(self)
+
+    def number(self):
+        value = self.tok_value
+        self.advance()
+        return ('NUMBER', value)
+
+    def identifier(self):
+        identifier = self.tok_value
+        self.advance()
+        return ('ID', identifier)
+
+    def parenthesized(self):
+        self.advance()
+        result = self.expression()
+        self.eat(_T_RPAREN)
+        return result
+
+    _DECL_DISPATCH = {
+        _T_VAR: variable_declaration,
+    }
+
+    _FACTOR_DISPATCH = {
+        _T_NUMBER: number,
+        _T_ID: identifier,
+        _T_LPAREN: parenthesized,
+    }
 
 def main():
     text = """
@@ -177,15 +334,12 @@ def main():
     print("Tokens:")
     lexer = Lexer(text)
     tokens = lexer.generate_tokens()
-    for token in tokens:
-        print(token)
+    sys.stdout.write(''.join(f'{token!r}\n' for token in tokens))
 
     print("\nAbstract Syntax Tree:")
-    lexer = Lexer(text)
-    tokens = lexer.generate_tokens()
-    parser = Parser(tokens)
+    parser = Parser(text)
     program_ast = parser.parse()
-    print(program_ast)
+    print(format_ast(program_ast))
 
     print("\nGrammar:")
     print("""
@@ -0,0 +1,178 @@
+/*
+ * Optional C scanner for Parser.py.
+ *
+ * tokenize(text, pos=0) scans text from pos to the end and returns a pair of
+ * lists (types, values) in the same shape as Lexer.tokenize(). Character
+ * classes follow the master regex in Parser.py: whitespace is str.isspace(),
+ * numbers are runs of decimal digits, identifiers start with a letter or '_'
+ * and continue with letters, digits or '_'.
+ *
+ * The type codes below must stay in the order of _TYPE_NAMES in Parser.py.
+ */
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+enum {
+    T_EOF,
+    T_NUMBER,
+    T_ID,
+    T_VAR,
+    T_ADD,
+    T_SUB,
+    T_MUL,
+    T_DIV,
+    T_ASSIGN,
+    T_EQ,
+    T_LPAREN,
+    T_RPAREN,
+    T_LBRACE,
+    T_RBRACE,
+    T_SEMICOLON,
+};
+
+static int
+punct_type(Py_UCS4 ch)
+{
+    switch (ch) {
+    case '+': return T_ADD;
+    case '-': return T_SUB;
+    case '*': return T_MUL;
+    case '/': return T_DIV;
+    case '(': return T_LPAREN;
+    case ')': return T_RPAREN;
+    case '{': return T_LBRACE;
+    case '}': return T_RBRACE;
+    case ';': return T_SEMICOLON;
+    default: return -1;
+    }
+}
+
+static int
+append_token(PyObject *types, PyObject *values, int type, PyObject *value)
+{
+    PyObject *code;
+    int rc;
+
+    if (value == NULL) {
+        return -1;
+    }
+    code = PyLong_FromLong(type);
+    if (code == NULL) {
+        Py_DECREF(value);
+        return -1;
+    }
+    rc = PyList_Append(types, code);
+    Py_DECREF(code);
+    if (rc == 0) {
+        rc = PyList_Append(values, value);
+    }
+    Py_DECREF(value);
+    return rc;
+}
+
+static PyObject *
+clexer_tokenize(PyObject *module, PyObject *args)
+{
+    PyObject *text, *types, *values, *value;
+    Py_ssize_t pos = 0, start, end;
+    int kind, type;
+    const void *data;
+    Py_UCS4 ch;
+
+    if (!PyArg_ParseTuple(args, "U|n:tokenize", &text, &pos)) {
+        return NULL;
+    }
+    kind = PyUnicode_KIND(text);
+    data = PyUnicode_DATA(text);
+    end = PyUnicode_GET_LENGTH(text);
+
+    types = PyList_New(0);
+    values = PyList_New(0);
+    if (types == NULL || values == NULL) {
+        goto error;
+    }
+
+    while (pos < end) {
+        ch = PyUnicode_READ(kind, data, pos);
+        if (Py_UNICODE_ISSPACE(ch)) {
+            pos++;
+            continue;
+        }
+        start = pos;
+        type = punct_type(ch);
+        if (type >= 0) {
+            pos++;
+            value = PyUnicode_Substring(text, start, pos);
+        }
+        else if (ch == '=') {
+            pos++;
+            if (pos < end && PyUnicode_READ(kind, data, pos) == '=') {
+                pos++;
+                type = T_EQ;
+            }
+            else {
+                type = T_ASSIGN;
+            }
+            value = PyUnicode_Substring(text, start, pos);
+        }
+        else if (Py_UNICODE_ISDECIMAL(ch)) {
+            PyObject *digits;
+
+            do {
+                pos++;
+            } while (pos < end && Py_UNICODE_ISDECIMAL(PyUnicode_READ(kind, data, pos)));
+            digits = PyUnicode_Substring(text, start, pos);
+            if (digits == NULL) {
+                goto error;
+            }
+            type = T_NUMBER;
+            value = PyLong_FromUnicodeObject(digits, 10);
+            Py_DECREF(digits);
+        }
+        else if (ch == '_' || Py_UNICODE_ISALNUM(ch)) {
+            do {
+                pos++;
+                ch = pos < end ? PyUnicode_READ(kind, data, pos) : 0;
+            } while (pos < end && (ch == '_' || Py_UNICODE_ISALNUM(ch)));
+            value = PyUnicode_Substring(text, start, pos);
+            if (value == NULL) {
+                goto error;
+            }
+            type = PyUnicode_CompareWithASCIIString(value, "var") == 0 ? T_VAR : T_ID;
+        }
+        else {
+            PyErr_Format(PyExc_Exception, "Illegal character: %c", (int)ch);
+            goto error;
+        }
+        if (append_token(types, values, type, value) < 0) {
+            goto error;
+        }
+    }
+    return Py_BuildValue("(NN)", types, values);
+
+error:
+    Py_XDECREF(types);
+    Py_XDECREF(values);
+    return NULL;
+}
+
+static PyMethodDef clexer_methods[] = {
+    {"tokenize", clexer_tokenize, METH_VARARGS,
+     "tokenize(text, pos=0) -> (types, values)"},
+    {NULL, NULL, 0, NULL},
+};
+
+static struct PyModuleDef clexer_module = {
+    PyModuleDef_HEAD_INIT,
+    "_clexer",
+    "Optional C scanner for Parser.py.",
+    -1,
+    clexer_methods,
+};
+
+PyMODINIT_FUNC
+PyInit__clexer(void)
+{
+    return PyModule_Create(&clexer_module);
+}
@@ -0,0 +1,16 @@
+from Cython.Build import cythonize
+from setuptools import Extension, setup
+
+# Cython is a build requirement (see pyproject.toml); Parser.py stays
+# importable as plain Python when used from a source checkout.
+ext_modules = cythonize('Parser.py', language_level=3)
+
+# The C scanner is optional: if it fails to build, Lexer.tokenize() falls
+# back to the Python scanner.
+ext_modules.append(Extension('_clexer', ['_clexer.c'], optional=True))
+
+setup(
+    name='Parser',
+    py_modules=['Parser'],
+    ext_modules=ext_modules,
+)
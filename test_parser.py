@@ -0,0 +1,115 @@
+import unittest
+from unittest import mock
+
+import Parser
+from Parser import ASTNode, Lexer, Parser as P, format_ast
+
+try:
+    import _clexer
+except ImportError:
+    _clexer = None
+
+
+SOURCE = 'var y = (1+2)*3 - a/b;'
+
+# ASTNode repr of SOURCE as printed before the parser switched to tuples.
+SOURCE_AST = (
+    "ASTNode(PROGRAM, [ASTNode(VAR_DECL, ['y', ASTNode(-, [ASTNode(*, "
+    "[ASTNode(+, [ASTNode(NUMBER, [1]), ASTNode(NUMBER, [2])]), "
+    "ASTNode(NUMBER, [3])]), ASTNode(/, [ASTNode(ID, ['a']), ASTNode(ID, ['b'])])])])])"
+)
+
+
+class ParserTest(unittest.TestCase):
+    def test_parse_returns_tuples(self):
+        self.assertEqual(
+            P('var x = 1 + y * 2;').parse(),
+            ('PROGRAM', ('VAR_DECL', 'x', ('+', ('NUMBER', 1), ('*', ('ID', 'y'), ('NUMBER', 2))))),
+        )
+
+    def test_left_associative(self):
+        self.assertEqual(
+            P('var x = 1 - 2 - 3;').parse(),
+            ('PROGRAM', ('VAR_DECL', 'x', ('-', ('-', ('NUMBER', 1), ('NUMBER', 2)), ('NUMBER', 3)))),
+        )
+
+    def test_empty_program(self):
+        self.assertEqual(P(' \n ').parse(), ('PROGRAM',))
+
+    def test_format_ast_matches_astnode_repr(self):
+        tree = P(SOURCE).parse()
+        self.assertEqual(format_ast(tree), SOURCE_AST)
+        self.assertEqual(repr(ASTNode.lift(tree)), SOURCE_AST)
+
+    def test_lift_deep_tree(self):
+        tree = P('var x = ' + '+'.join(['1'] * 20000) + ';').parse()
+        self.assertEqual(repr(ASTNode.lift(tree)), format_ast(tree))
+
+    def test_missing_semicolon(self):
+        with self.assertRaisesRegex(SyntaxError, '^Expected SEMICOLON, got EOF$'):
+            P('var x = 1').parse()
+
+    def test_unexpected_token(self):
+        with self.assertRaisesRegex(SyntaxError, '^Unexpected token: ID$'):
+            P('x = 3;').parse()
+
+    def test_illegal_character(self):
+        with self.assertRaisesRegex(Exception, '^Illegal character: \\$$'):
+            P('var x = 1 $').parse()
+
+    def test_lone_surrogate_is_illegal(self):
+        for use_c in (True, False):
+            with mock.patch.object(Parser, '_c_tokenize', Parser._c_tokenize if use_c else None):
+                with self.assertRaises(Exception) as caught:
+                    P('var x = \ud800;').parse()
+                self.assertEqual(str(caught.exception), 'Illegal character: \ud800')
+
+    def test_no_tokens_lost_once_parsing_started(self):
+        for use_c in (True, False):
+            with mock.patch.object(Parser, '_c_tokenize', Parser._c_tokenize if use_c else None):
+                parser = P('var a = 1; var b = a + 2;')
+                self.assertEqual(parser.variable_declaration(), ('VAR_DECL', 'a', ('NUMBER', 1)))
+                self.assertEqual(
+                    parser.parse(),
+                    ('PROGRAM', ('VAR_DECL', 'b', ('+', ('ID', 'a'), ('NUMBER', 2)))),
+                )
+
+
+class LexerTest(unittest.TestCase):
+    def tokens(self, text):
+        return [(token.type, token.value) for token in Lexer(text).generate_tokens()]
+
+    def test_generate_tokens(self):
+        self.assertEqual(
+            self.tokens('var é1 = x == 10;'),
+            [('VAR', 'var'), ('ID', 'é1'), ('ASSIGN', '='), ('ID', 'x'),
+             ('EQ', '=='), ('NUMBER', 10), ('SEMICOLON', ';')],
+        )
+
+    def test_illegal_character(self):
+        with self.assertRaisesRegex(Exception, '^Illegal character: \\$$'):
+            Lexer('var x = 1 $').tokenize()
+
+    def test_generate_tokens_is_lazy(self):
+        tokens = Lexer('var x = 1 $').generate_tokens()
+        self.assertEqual([next(tokens).type for _ in range(4)], ['VAR', 'ID', 'ASSIGN', 'NUMBER'])
+        with self.assertRaisesRegex(Exception, '^Illegal character: \\$$'):
+            next(tokens)
+
+    @unittest.skipIf(_clexer is None, '_clexer is not built')
+    def test_c_scanner_matches_python_scanner(self):
+        # Covers every token kind, so a reordered type table shows up here.
+        text = 'var x_1 = (12 + y) - 3 * z / 4;{ a == b }\n é ²v'
+        with mock.patch.object(Parser, '_c_tokenize', None):
+            types, values = Lexer(text).tokenize()
+        self.assertEqual(sorted(set(types)), list(range(1, len(Parser._TYPE_NAMES))))
+        self.assertEqual(_clexer.tokenize(text), (list(types), values))
+
+    @unittest.skipIf(_clexer is None, '_clexer is not built')
+    def test_c_scanner_illegal_character(self):
+        with self.assertRaisesRegex(Exception, '^Illegal character: \\$$'):
+            _clexer.tokenize('var x = 1 $')
+
+
+if __name__ == '__main__':
+    unittest.main()